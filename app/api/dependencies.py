@@ -1,27 +1,40 @@
 """
 API dependency injection for HarvestHub application
 """
-from fastapi import Depends, HTTPException, UploadFile, File
-from typing import Optional
+from fastapi import HTTPException, Request, UploadFile, File
+from typing import Dict
 
 from app.core.config import settings
+from app.core.security import (
+    IMAGE_SIGNATURE_LENGTH, file_too_large_detail, sniff_image_type, validate_file_size
+)
+from app.schemas.prediction import LanguageInfo
 from app.services.model_service import ModelService
 from app.services.recommendation_service import RecommendationService
 
 
+_FILE_TOO_LARGE = file_too_large_detail(settings.MAX_FILE_SIZE)
+
+# Language info for every supported language, built once
+LANGUAGE_INFO: Dict[str, LanguageInfo] = {
+    code: LanguageInfo(code=code, name=name)
+    for code, name in settings.SUPPORTED_LANGUAGES.items()
+}
+
+
 # Service dependencies
-def get_model_service() -> ModelService:
-    """Get model service instance"""
-    return ModelService()
+def get_model_service(request: Request) -> ModelService:
+    """Get the model service instance created at startup"""
+    return request.app.state.model_service
 
 
-def get_recommendation_service() -> RecommendationService:
-    """Get recommendation service instance"""
-    return RecommendationService()
+def get_recommendation_service(request: Request) -> RecommendationService:
+    """Get the recommendation service instance created at startup"""
+    return request.app.state.recommendation_service
 
 
 # Validation dependencies
-def validate_language(lang: str) -> str:
+def validate_language(lang: str) -> LanguageInfo:
     """
     Validate language code
     
@@ -29,25 +42,27 @@ def validate_language(lang: str) -> str:
         lang: Language code to validate
     
     Returns:
-        str: Validated language code
+        LanguageInfo: Code and name of the validated language
     
     Raises:
         HTTPException: If language is not supported
     """
-    if lang not in settings.SUPPORTED_LANGUAGES:
+    language = LANGUAGE_INFO.get(lang)
+    if language is None:
         raise HTTPException(
             status_code=400,
             detail=f"Unsupported language code: {lang}. "
             f"Supported languages: {list(settings.SUPPORTED_LANGUAGES.keys())}"
         )
-    return lang
+    return language
 
 
-def validate_image_file(file: UploadFile = File(...)) -> UploadFile:
+def validate_image_file(request: Request, file: UploadFile = File(...)) -> UploadFile:
     """
     Validate uploaded image file
     
     Args:
+        request: Incoming request, used for the Content-Length header
         file: Uploaded file to validate
     
     Returns:
@@ -56,18 +71,28 @@ def validate_image_file(file: UploadFile = File(...)) -> UploadFile:
     Raises:
         HTTPException: If file validation fails
     """
+    # Backstop for UploadSizeLimitMiddleware, which rejects oversize uploads
+    # before FastAPI reads the body
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and \
+            not validate_file_size(int(content_length), settings.MAX_FILE_SIZE):
+        raise HTTPException(status_code=413, detail=_FILE_TOO_LARGE)
+    
     # Check if file is provided
     if not file.filename:
         raise HTTPException(status_code=400, detail="No image file selected")
     
-    # Check file extension
-    if file.filename:
-        file_extension = file.filename.rsplit('.', 1)[-1].lower()
-        if file_extension not in settings.ALLOWED_EXTENSIONS:
-            allowed = ", ".join(settings.ALLOWED_EXTENSIONS).upper()
-            raise HTTPException(
-                status_code=400,
-                detail=f"Invalid file type. Supported: {allowed}"
-            )
+    # Check the actual file type from its magic bytes rather than trusting the filename
+    header = file.file.read(IMAGE_SIGNATURE_LENGTH)
+    file.file.seek(0)
+    if sniff_image_type(header) not in settings.ALLOWED_EXTENSIONS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid file type. Supported: {settings.ALLOWED_EXTENSIONS_DISPLAY}"
+        )
+    
+    # Check file size
+    if file.size is not None and not validate_file_size(file.size, settings.MAX_FILE_SIZE):
+        raise HTTPException(status_code=413, detail=_FILE_TOO_LARGE)
     
     return file
@@ -1,19 +1,23 @@
 """
 Documentation and utility endpoints
 """
-from fastapi import APIRouter
+from fastapi import APIRouter, Request, Response
+
+from app.core.responses import StaticJSON
 
 router = APIRouter(prefix="/docs-info", tags=["Documentation"])
 
+_DOCS_INFO = StaticJSON({
+    "message": "Visit /docs for interactive API documentation",
+    "swagger_ui": "/docs",
+    "redoc": "/redoc",
+    "openapi_json": "/openapi.json",
+    "postman_collection": "/docs#/",
+    "api_version": "3.0.0"
+})
+
 
 @router.get("")
-async def docs_info():
+async def docs_info(request: Request) -> Response:
     """Information about API documentation"""
-    return {
-        "message": "Visit /docs for interactive API documentation",
-        "swagger_ui": "/docs",
-        "redoc": "/redoc",
-        "openapi_json": "/openapi.json",
-        "postman_collection": "/docs#/",
-        "api_version": "3.0.0"
-    }
+    return _DOCS_INFO.response(request)
@@ -1,45 +1,43 @@
 """
 Health check endpoints
 """
-from fastapi import APIRouter, Depends, Request
-from datetime import datetime
+from fastapi import APIRouter, Request, Response
 
-from app.api.dependencies import get_model_service
 from app.core.config import settings
+from app.core.responses import StaticJSON, prerender_json
+from app.core.timeutils import utc_now_iso_seconds
 from app.schemas.responses import HealthResponse, DetailedHealthResponse, StatusResponse
 from app.services.model_service import ModelService
 
 router = APIRouter(prefix="", tags=["Health"])
 
+# Health payload is static, so serialize it once
+_HEALTH = StaticJSON(HealthResponse(
+    status="success",
+    message="HarvestHub Pest Detection API is running",
+    version=settings.API_VERSION,
+    features=[
+        "Multi-language pest detection",
+        "AI-powered recommendations", 
+        "Firebase caching",
+        f"{len(settings.SUPPORTED_LANGUAGES)} Indian languages supported",
+        "Async FastAPI architecture"
+    ]
+))
+
 
 @router.get("/", response_model=HealthResponse)
-async def health_check() -> HealthResponse:
+async def health_check(request: Request) -> Response:
     """Main health check endpoint"""
-    return HealthResponse(
-        status="success",
-        message="HarvestHub Pest Detection API is running",
-        version=settings.API_VERSION,
-        features=[
-            "Multi-language pest detection",
-            "AI-powered recommendations", 
-            "Firebase caching",
-            f"{len(settings.SUPPORTED_LANGUAGES)} Indian languages supported",
-            "Async FastAPI architecture"
-        ]
-    )
+    return _HEALTH.response(request)
 
 
-@router.get("/health", response_model=DetailedHealthResponse)
-async def detailed_health(
-    model_service: ModelService = Depends(get_model_service)
-) -> DetailedHealthResponse:
-    """Detailed health check endpoint"""
-    model_loaded = model_service.is_model_loaded()
-    
-    return DetailedHealthResponse(
+def _build_detailed_health(model_service: ModelService) -> StaticJSON:
+    """Render the detailed health payload for a loaded model service"""
+    return StaticJSON(DetailedHealthResponse(
         status="success",
         health={
-            "model_loaded": model_loaded,
+            "model_loaded": model_service.is_model_loaded(),
             "labels_loaded": model_service.get_total_classes() > 0,
             "total_classes": model_service.get_total_classes(),
             "framework": "FastAPI",
@@ -47,15 +45,37 @@ async def detailed_health(
             "environment": settings.ENVIRONMENT,
             "supported_languages": len(settings.SUPPORTED_LANGUAGES)
         }
-    )
+    ))
+
+
+@router.get("/health", response_model=DetailedHealthResponse)
+async def detailed_health(request: Request) -> Response:
+    """Detailed health check endpoint"""
+    # Model and label state is fixed once startup completes, so render it once.
+    # Read app state directly; probes hit this often and need no DI.
+    state = request.app.state
+    detailed = getattr(state, "detailed_health", None)
+    if detailed is None:
+        detailed = state.detailed_health = _build_detailed_health(state.model_service)
+    return detailed.response(request)
+
+
+# Rendered /status body, refreshed when the second-resolution timestamp changes
+_status_timestamp = ""
+_status_body = b""
 
 
 @router.get("/status", response_model=StatusResponse)
-async def status() -> StatusResponse:
+async def status() -> Response:
     """Quick status check"""
-    return StatusResponse(
-        status="online",
-        framework="FastAPI",
-        version=settings.API_VERSION,
-        timestamp=datetime.utcnow().isoformat()
-    )
+    global _status_timestamp, _status_body
+    timestamp = utc_now_iso_seconds()
+    if timestamp != _status_timestamp:
+        _status_body = prerender_json(StatusResponse(
+            status="online",
+            framework="FastAPI",
+            version=settings.API_VERSION,
+            timestamp=timestamp
+        ))
+        _status_timestamp = timestamp
+    return Response(content=_status_body, media_type="application/json")
@@ -1,19 +1,23 @@
 """
 Language-related endpoints
 """
-from fastapi import APIRouter
+from fastapi import APIRouter, Request, Response
 
 from app.core.config import settings
+from app.core.responses import StaticJSON
 from app.schemas.responses import LanguagesResponse
 
 router = APIRouter(prefix="/languages", tags=["Languages"])
 
+# Language list is static, so serialize it once
+_LANGUAGES = StaticJSON(LanguagesResponse(
+    status="success",
+    supported_languages=settings.SUPPORTED_LANGUAGES,
+    total_languages=len(settings.SUPPORTED_LANGUAGES)
+))
+
 
 @router.get("", response_model=LanguagesResponse)
-async def get_supported_languages() -> LanguagesResponse:
+async def get_supported_languages(request: Request) -> Response:
     """Get list of supported languages"""
-    return LanguagesResponse(
-        status="success",
-        supported_languages=settings.SUPPORTED_LANGUAGES,
-        total_languages=len(settings.SUPPORTED_LANGUAGES)
-    )
+    return _LANGUAGES.response(request)
@@ -1,11 +1,12 @@
 """
 Configuration settings for HarvestHub FastAPI application
 """
-import os
 from typing import List, Optional, Union
 from pydantic_settings import BaseSettings
 from pydantic import field_validator
 
+from app.core.constants import LANGUAGES
+
 
 class Settings(BaseSettings):
     """Application settings"""
@@ -18,9 +19,10 @@ class Settings(BaseSettings):
     # Server Configuration
     HOST: str = "0.0.0.0"
     PORT: int = 8000
-    WORKERS: int = 4
+    WORKERS: int = 1  # Uvicorn processes; inference threads default to cores / WORKERS
     RELOAD: bool = False
     LOG_LEVEL: str = "info"
+    ACCESS_LOG: bool = False  # Per-request access lines from uvicorn and the app; costly under load
     
     # CORS Configuration
     ALLOWED_ORIGINS: Union[List[str], str] = ["*"]
@@ -29,65 +31,58 @@ class Settings(BaseSettings):
     
     # File Upload Configuration
     MAX_FILE_SIZE: int = 16 * 1024 * 1024  # 16MB
-    ALLOWED_EXTENSIONS: set = {"png", "jpg", "jpeg", "gif", "bmp"}
+    ALLOWED_EXTENSIONS: frozenset = frozenset({"png", "jpg", "jpeg", "gif", "bmp"})
+    ALLOWED_EXTENSIONS_DISPLAY: str = "PNG, JPG, JPEG, GIF, BMP"
     
     # Model Configuration
     MODEL_PATH: str = "app/data/model.h5"
+    TFLITE_MODEL_PATH: str = "app/data/model.tflite"  # Preferred over MODEL_PATH when present
+    MODEL_PRECISION: str = "auto"  # TFLite variant: auto, int8 (*_int8.tflite), fp16 (*_fp16.tflite) or fp32
+    TFLITE_NUM_THREADS: Optional[int] = None  # Defaults to cores / WORKERS
+    OPENVINO_MODEL_PATH: str = "app/data/model.xml"  # OpenVINO IR; preferred over TFLite/H5 when present
+    ONNX_MODEL_PATH: str = "app/data/model.onnx"  # ONNX Runtime; preferred over TFLite/H5 when present
     LABELS_PATH: str = "app/data/labels.txt"
     IMAGE_SIZE: tuple = (224, 224)
+    TF_IMAGE_DECODE: bool = False  # Decode/resize in the TF graph (Keras model only); slightly differs from PIL
+    OPENCV_IMAGE_DECODE: bool = False  # Decode/resize with OpenCV when installed; INTER_AREA slightly differs from PIL LANCZOS
+    TF_INTRA_OP_THREADS: Optional[int] = None  # Threads inside one op; defaults to cores / WORKERS
+    TF_INTER_OP_THREADS: int = 2  # Independent ops run concurrently
+    INFERENCE_DEVICE: str = "/CPU:0"  # e.g. "/GPU:0" when CUDA is available
+    DETERMINISTIC_INFERENCE: bool = False  # Seed TF and force deterministic kernels (Keras model only)
+    XLA_JIT_COMPILE: bool = False  # XLA-compile the Keras forward pass; benchmark on the target CPU first
+    BATCH_INFERENCE: bool = False  # Micro-batch concurrent predictions (Keras and TFLite models)
+    BATCH_MAX_SIZE: int = 32
+    BATCH_MAX_WAIT_MS: float = 5.0
+    PREDICTION_CACHE_SIZE: int = 1024  # Recent predictions kept by image hash; 0 disables
     
     # External API Configuration
     GEMINI_API_KEY: Optional[str] = None
     FIREBASE_KEY_PATH: str = "app/firebase-key.json"
+    HTTP_POOL_LIMIT: int = 200  # Shared aiohttp connection pool for Gemini calls
+    HTTP_POOL_LIMIT_PER_HOST: int = 50
+    HTTP_KEEPALIVE_TIMEOUT: float = 60.0  # Keep idle TLS connections open between bursts
+    HTTP_TIMEOUT: float = 30.0
     
     # Cache Configuration
     CACHE_ENABLED: bool = True
     CACHE_TTL: int = 3600  # 1 hour
+    STATIC_CACHE_MAX_AGE: int = 60  # Cache-Control max-age for static endpoints
     
     # Environment
     ENVIRONMENT: str = "development"
     DEBUG: bool = False
-      # Supported languages
-    SUPPORTED_LANGUAGES: dict = {
-        'en': 'English',
-        'hi': 'Hindi',
-        'ta': 'Tamil',
-        'te': 'Telugu',
-        'kn': 'Kannada',
-        'ml': 'Malayalam',
-        'mr': 'Marathi',
-        'gu': 'Gujarati',
-        'bn': 'Bengali',
-        'pa': 'Punjabi',
-        'or': 'Odia',
-        'as': 'Assamese'
-    }
+    DOCS_ENABLED: bool = True  # Serve /docs, /redoc and /openapi.json
     
-    @field_validator('ALLOWED_ORIGINS', mode='before')
-    @classmethod
-    def parse_cors_origins(cls, v):
-        if isinstance(v, str):
-            if v == "*":
-                return ["*"]
-            return [origin.strip() for origin in v.split(",") if origin.strip()]
-        return v
+    # Supported languages
+    SUPPORTED_LANGUAGES: dict = dict(LANGUAGES)
     
-    @field_validator('ALLOWED_METHODS', mode='before')
+    @field_validator('ALLOWED_ORIGINS', 'ALLOWED_METHODS', 'ALLOWED_HEADERS', mode='before')
     @classmethod
-    def parse_cors_methods(cls, v):
+    def parse_cors_list(cls, v):
         if isinstance(v, str):
             if v == "*":
                 return ["*"]
-            return [method.strip() for method in v.split(",") if method.strip()]
-        return v
-    
-    @field_validator('ALLOWED_HEADERS', mode='before')
-    @classmethod
-    def parse_cors_headers(cls, v):
-        if isinstance(v, str):
-            if v == "*":
-                return ["*"]
-            return [header.strip() for header in v.split(",") if header.strip()]
+            return [item.strip() for item in v.split(",") if item.strip()]
         return v
     
     class Config:
@@ -97,36 +92,3 @@ class Settings(BaseSettings):
 
 # Global settings instance
 settings = Settings()
-
-
-# Supported languages configuration
-SUPPORTED_LANGUAGES = {
-    'en': 'English',
-    'hi': 'Hindi',
-    'ta': 'Tamil',
-    'te': 'Telugu',
-    'kn': 'Kannada',
-    'ml': 'Malayalam',
-    'mr': 'Marathi',
-    'gu': 'Gujarati',
-    'bn': 'Bengali',
-    'pa': 'Punjabi',
-    'or': 'Odia',
-    'as': 'Assamese'
-}
-
-# Language mappings for Gemini prompts
-LANGUAGE_NAMES = {
-    'en': 'English',
-    'hi': 'Hindi (हिन्दी)',
-    'ta': 'Tamil (தமிழ்)',
-    'te': 'Telugu (తెలుగు)',
-    'kn': 'Kannada (ಕನ್ನಡ)',
-    'ml': 'Malayalam (മലയാളം)',
-    'mr': 'Marathi (मराठी)',
-    'gu': 'Gujarati (ગુજરાતી)',
-    'bn': 'Bengali (বাংলা)',
-    'pa': 'Punjabi (ਪੰਜਾਬੀ)',
-    'or': 'Odia (ଓଡ଼ିଆ)',
-    'as': 'Assamese (অসমীয়া)'
-}
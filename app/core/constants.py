@@ -0,0 +1,37 @@
+"""
+Constants for HarvestHub application
+"""
+from types import MappingProxyType
+
+
+# Supported languages: code -> English name
+LANGUAGES = MappingProxyType({
+    'en': 'English',
+    'hi': 'Hindi',
+    'ta': 'Tamil',
+    'te': 'Telugu',
+    'kn': 'Kannada',
+    'ml': 'Malayalam',
+    'mr': 'Marathi',
+    'gu': 'Gujarati',
+    'bn': 'Bengali',
+    'pa': 'Punjabi',
+    'or': 'Odia',
+    'as': 'Assamese'
+})
+
+# Language names for Gemini prompts, including the native script
+LANGUAGE_NAMES = MappingProxyType({
+    'en': 'English',
+    'hi': 'Hindi (हिन्दी)',
+    'ta': 'Tamil (தமிழ்)',
+    'te': 'Telugu (తెలుగు)',
+    'kn': 'Kannada (ಕನ್ನಡ)',
+    'ml': 'Malayalam (മലയാളം)',
+    'mr': 'Marathi (मराठी)',
+    'gu': 'Gujarati (ગુજરાતી)',
+    'bn': 'Bengali (বাংলা)',
+    'pa': 'Punjabi (ਪੰਜਾਬੀ)',
+    'or': 'Odia (ଓଡ଼ିଆ)',
+    'as': 'Assamese (অসমীয়া)'
+})
@@ -0,0 +1,66 @@
+"""
+Application lifespan handler for HarvestHub FastAPI application
+"""
+import logging
+from contextlib import asynccontextmanager
+
+import aiohttp
+from fastapi import FastAPI
+
+from app.core.config import settings
+from app.core.middleware import start_queued_logging, stop_queued_logging
+from app.services.model_service import ModelService
+from app.services.recommendation_service import RecommendationService
+
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create shared services once at startup and store them in app state"""
+    # Startup
+    start_queued_logging()
+    logger.info("🚀 HarvestHub FastAPI server starting up...")
+    
+    # Initialize model service; this is the only instance, shared through app state
+    model_service = ModelService()
+    model_service.warm_up()
+    if settings.BATCH_INFERENCE:
+        model_service.start_batching()
+    
+    # Shared HTTP session so Gemini calls reuse pooled keep-alive connections
+    http_client = aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(
+            limit=settings.HTTP_POOL_LIMIT,
+            limit_per_host=settings.HTTP_POOL_LIMIT_PER_HOST,
+            keepalive_timeout=settings.HTTP_KEEPALIVE_TIMEOUT,
+            ttl_dns_cache=300
+        ),
+        timeout=aiohttp.ClientTimeout(total=settings.HTTP_TIMEOUT)
+    )
+    
+    # Initialize recommendation service (Firebase, Gemini)
+    recommendation_service = RecommendationService(http_client=http_client)
+    await recommendation_service.initialize()
+    
+    # Store in app state
+    app.state.http_client = http_client
+    app.state.model_service = model_service
+    app.state.recommendation_service = recommendation_service
+    
+    # Build the OpenAPI schema now so the first /docs visit doesn't pay for it
+    if app.openapi_url:
+        app.openapi()
+    
+    logger.info("📊 Model loaded: %s", model_service.is_model_loaded())
+    logger.info("🏷️ Labels loaded: %s classes", model_service.get_total_classes())
+    logger.info("🌐 Supported languages: %s", len(settings.SUPPORTED_LANGUAGES))
+    logger.info("✅ FastAPI server ready!")
+    
+    yield
+    
+    # Shutdown
+    logger.info("🛑 HarvestHub FastAPI server shutting down...")
+    await model_service.stop_batching()
+    await http_client.close()
+    stop_queued_logging()
@@ -2,42 +2,179 @@
 Custom middleware for HarvestHub FastAPI application
 """
 
+import logging
+import queue
 import time
-from typing import Callable
-from fastapi import FastAPI, Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
 
+import orjson
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+from fastapi import FastAPI
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
-class ProcessTimeMiddleware(BaseHTTPMiddleware):
-    """Middleware to add process time header"""
+from app.core.config import settings
+from app.core.security import file_too_large_detail
+
+
+access_logger = logging.getLogger("harvesthub.access")
+
+# Upload routes whose request bodies are capped at MAX_FILE_SIZE
+_UPLOAD_PATH_PREFIX = "/predict"
+
+# Loggers whose records are written from the background thread: access logs
+# and everything under the app package (services, helpers)
+_QUEUED_LOGGERS = (access_logger, logging.getLogger("app"))
+
+_log_listener: Optional[QueueListener] = None
+
+
+def start_queued_logging() -> None:
+    """Write access and application log records from a background thread via a queue"""
+    global _log_listener
+    if _log_listener is not None:
+        return
+    
+    log_queue = queue.SimpleQueue()
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+    
+    queue_handler = QueueHandler(log_queue)
+    for logger in _QUEUED_LOGGERS:
+        logger.addHandler(queue_handler)
+        logger.propagate = False
+    
+    _log_listener = QueueListener(log_queue, handler)
+    _log_listener.start()
+
+
+def stop_queued_logging() -> None:
+    """Flush pending log records and stop the background thread"""
+    global _log_listener
+    if _log_listener is None:
+        return
+    
+    _log_listener.stop()
+    _log_listener = None
     
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        start_time = time.time()
-        response = await call_next(request)
-        process_time = time.time() - start_time
-        response.headers["X-Process-Time"] = str(process_time)
-        return response
+    for logger in _QUEUED_LOGGERS:
+        for handler in list(logger.handlers):
+            if isinstance(handler, QueueHandler):
+                logger.removeHandler(handler)
+        logger.propagate = True
 
 
-class RequestLoggingMiddleware(BaseHTTPMiddleware):
-    """Middleware for request logging"""
+class AccessMiddleware:
+    """Pure ASGI middleware that adds the process time header and logs requests"""
     
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        start_time = time.time()
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        start_time = time.perf_counter()
+        log_enabled = access_logger.isEnabledFor(logging.INFO)
+        status_code = 500
         
         # Log request
-        print(f"🔍 {request.method} {request.url.path} - {request.client.host}")
+        if log_enabled:
+            client = scope.get("client")
+            client_host = client[0] if client else "-"
+            access_logger.info("🔍 %s %s - %s", scope["method"], scope["path"], client_host)
         
-        response = await call_next(request)
+        async def send_with_process_time(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                process_time = str(time.perf_counter() - start_time).encode("latin-1")
+                message = {
+                    **message,
+                    "headers": [*message.get("headers", []), (b"x-process-time", process_time)],
+                }
+            await send(message)
+        
+        await self.app(scope, receive, send_with_process_time)
         
         # Log response
-        process_time = time.time() - start_time
-        print(f"✅ {response.status_code} - {process_time:.4f}s")
+        if log_enabled:
+            process_time = time.perf_counter() - start_time
+            access_logger.info("✅ %s - %.4fs", status_code, process_time)
+
+
+class UploadSizeLimitMiddleware:
+    """
+    Pure ASGI middleware that rejects oversize uploads with 413 before the body is read
+    
+    A declared Content-Length over the limit is refused without reading anything.
+    Bodies without one (chunked) are counted as they stream in; once the limit is
+    passed the 413 is sent and the app sees a client disconnect.
+    """
+    
+    def __init__(self, app: ASGIApp, max_body_size: int) -> None:
+        self.app = app
+        self.max_body_size = max_body_size
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] != "POST" \
+                or not scope["path"].startswith(_UPLOAD_PATH_PREFIX):
+            await self.app(scope, receive, send)
+            return
+        
+        for name, value in scope["headers"]:
+            if name == b"content-length":
+                if value.isdigit() and int(value) > self.max_body_size:
+                    await self._send_too_large(scope, send)
+                    return
+                break
+        
+        received = 0
+        rejected = False
         
-        return response
+        async def limited_receive() -> Message:
+            nonlocal received, rejected
+            if rejected:
+                return {"type": "http.disconnect"}
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_body_size:
+                    rejected = True
+                    await self._send_too_large(scope, send)
+                    return {"type": "http.disconnect"}
+            return message
+        
+        async def guarded_send(message: Message) -> None:
+            # The 413 has already been sent; drop whatever the app replies to the disconnect
+            if not rejected:
+                await send(message)
+        
+        await self.app(scope, limited_receive, guarded_send)
+    
+    async def _send_too_large(self, scope: Scope, send: Send) -> None:
+        body = orjson.dumps({
+            "status": "error",
+            "message": file_too_large_detail(self.max_body_size),
+            "path": scope["path"]
+        })
+        await send({
+            "type": "http.response.start",
+            "status": 413,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode("latin-1")),
+                (b"connection", b"close"),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
 
 
 def add_custom_middleware(app: FastAPI) -> None:
     """Add custom middleware to FastAPI app"""
-    app.add_middleware(ProcessTimeMiddleware)
-    app.add_middleware(RequestLoggingMiddleware)
+    # With access logs off the middleware skips formatting and only sets the timing header
+    if not settings.ACCESS_LOG:
+        access_logger.setLevel(logging.WARNING)
+    # Added first so it sits inside AccessMiddleware and 413s are still timed and logged
+    app.add_middleware(UploadSizeLimitMiddleware, max_body_size=settings.MAX_FILE_SIZE)
+    app.add_middleware(AccessMiddleware)
@@ -0,0 +1,53 @@
+"""
+Response helpers for HarvestHub FastAPI application
+"""
+import hashlib
+from typing import Any
+
+import orjson
+from fastapi import Request, Response
+from pydantic import BaseModel
+
+from app.core.config import settings
+
+
+def prerender_json(content: Any) -> bytes:
+    """
+    Serialize static response content once, typically at import time
+    
+    Args:
+        content: Pydantic model or JSON-serializable object
+    
+    Returns:
+        bytes: UTF-8 encoded JSON body
+    """
+    if isinstance(content, BaseModel):
+        return content.model_dump_json().encode("utf-8")
+    return orjson.dumps(content)
+
+
+class StaticJSON:
+    """Pre-rendered JSON body with an ETag for conditional GET requests"""
+    
+    __slots__ = ("body", "etag", "headers")
+    
+    def __init__(self, content: Any):
+        self.body = prerender_json(content)
+        self.etag = f'"{hashlib.blake2b(self.body, digest_size=8).hexdigest()}"'
+        self.headers = {
+            "ETag": self.etag,
+            "Cache-Control": f"public, max-age={settings.STATIC_CACHE_MAX_AGE}",
+        }
+    
+    def _matches(self, if_none_match: str) -> bool:
+        """Check an If-None-Match header value against this body's ETag"""
+        if if_none_match.strip() == "*":
+            return True
+        return any(tag.strip().removeprefix("W/") == self.etag for tag in if_none_match.split(","))
+    
+    def response(self, request: Request) -> Response:
+        """Return the cached body, or 304 Not Modified if the client has it"""
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and self._matches(if_none_match):
+            return Response(status_code=304, headers=self.headers)
+        return Response(content=self.body, media_type="application/json", headers=self.headers)
@@ -1,40 +1,41 @@
 """
 Security utilities for HarvestHub application
 """
-from fastapi import Depends, HTTPException, status
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from typing import Optional
 
 
-security = HTTPBearer(auto_error=False)
+# Leading bytes of each supported image format
+_IMAGE_SIGNATURES = (
+    (b'\xff\xd8\xff', 'jpeg'),
+    (b'\x89PNG\r\n\x1a\n', 'png'),
+    (b'GIF87a', 'gif'),
+    (b'GIF89a', 'gif'),
+    (b'BM', 'bmp'),
+)
 
+# Number of bytes needed to recognize any signature above
+IMAGE_SIGNATURE_LENGTH = 8
 
-async def get_api_key(credentials: Optional[HTTPAuthorizationCredentials] = Depends(security)) -> Optional[str]:
-    """
-    Extract API key from Authorization header
-    Optional for now, can be made required later
-    """
-    if credentials:
-        return credentials.credentials
-    return None
 
-
-def validate_file_type(filename: str, allowed_extensions: set) -> bool:
+def sniff_image_type(header: bytes) -> Optional[str]:
     """
-    Validate file extension
+    Detect image format from the file's leading bytes
     
     Args:
-        filename: Name of the file
-        allowed_extensions: Set of allowed extensions
+        header: First IMAGE_SIGNATURE_LENGTH bytes of the file
     
     Returns:
-        bool: True if valid, False otherwise
+        str or None: Format name ('jpeg', 'png', 'gif', 'bmp') if recognized
     """
-    if not filename or '.' not in filename:
-        return False
-    
-    extension = filename.rsplit('.', 1)[1].lower()
-    return extension in allowed_extensions
+    for signature, image_type in _IMAGE_SIGNATURES:
+        if header.startswith(signature):
+            return image_type
+    return None
+
+
+def file_too_large_detail(max_size: int) -> str:
+    """Error message for uploads over max_size bytes"""
+    return f"File too large. Maximum size: {max_size // (1024 * 1024)}MB"
 
 
 def validate_file_size(file_size: int, max_size: int) -> bool:
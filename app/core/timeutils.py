@@ -0,0 +1,29 @@
+"""
+Timestamp helpers for HarvestHub FastAPI application
+"""
+import time
+from datetime import datetime, timezone
+
+
+_cached_second = -1
+_cached_iso = ""
+
+
+def utc_now_iso() -> str:
+    """Current UTC time as an ISO 8601 string (naive, without an offset suffix)"""
+    return datetime.now(timezone.utc).replace(tzinfo=None).isoformat()
+
+
+def utc_now_iso_seconds() -> str:
+    """
+    Current UTC time as an ISO 8601 string at second resolution
+    
+    The formatted string is reused until the wall-clock second changes,
+    which suits high-traffic endpoints such as /status.
+    """
+    global _cached_second, _cached_iso
+    now = int(time.time())
+    if now != _cached_second:
+        _cached_iso = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(now))
+        _cached_second = now
+    return _cached_iso
@@ -1,114 +1,158 @@
+import logging
 import os
-import json
+import re
+import orjson
+import time
 import asyncio
 import aiohttp
-from datetime import datetime
+from collections import OrderedDict
 from dotenv import load_dotenv
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple
+
+from app.core.constants import LANGUAGE_NAMES
+
+logger = logging.getLogger(__name__)
 
 # Load environment variables
 load_dotenv()
 
-# Initialize Firebase
-try:
-    import firebase_admin
-    from firebase_admin import credentials, firestore
+# Firebase and Gemini clients, created by initialize_clients() at startup
+db = None
+gemini_api_key = None
+
+# Gemini REST endpoint, called through a shared aiohttp session
+GEMINI_API_URL = "https://generativelanguage.googleapis.com/v1beta/models/gemini-1.5-flash:generateContent"
+
+# Process-local LRU of recommendations keyed by "label::lang", checked before Firestore
+MEMORY_CACHE_SIZE = 4096
+_memory_cache: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()  # key -> (expires_at, data)
+
+# Firestore allows at most 500 writes per batch
+FIRESTORE_BATCH_SIZE = 500
+
+# Background Firestore writes in flight by cache key; holds task references and dedupes writes
+_pending_writes: Dict[str, asyncio.Task] = {}
+
+def initialize_firebase() -> None:
+    """Initialize Firebase app and Firestore client"""
+    global db
+    if db is not None:
+        return
     
-    # Initialize Firebase app
-    firebase_key_path = os.path.join(os.path.dirname(__file__), 'firebase-key.json')
-    if os.path.exists(firebase_key_path):
-        cred = credentials.Certificate(firebase_key_path)
-        if not firebase_admin._apps:
-            firebase_admin.initialize_app(cred)
-        db = firestore.client()
-        print("Firebase initialized successfully")
-    else:
-        print("Warning: Firebase key file not found. Caching disabled.")
+    try:
+        import firebase_admin
+        from firebase_admin import credentials, firestore
+        
+        # Initialize Firebase app
+        firebase_key_path = os.path.join(os.path.dirname(__file__), 'firebase-key.json')
+        if os.path.exists(firebase_key_path):
+            cred = credentials.Certificate(firebase_key_path)
+            if not firebase_admin._apps:
+                firebase_admin.initialize_app(cred)
+            db = firestore.client()
+            logger.info("Firebase initialized successfully")
+        else:
+            logger.warning("Firebase key file not found. Caching disabled.")
+            db = None
+    except Exception as e:
+        logger.warning("Firebase initialization failed: %s", e)
         db = None
-except Exception as e:
-    print(f"Warning: Firebase initialization failed: {e}")
-    db = None
 
-# Initialize Gemini API
-try:
-    import google.generativeai as genai
+def initialize_gemini() -> None:
+    """Load Gemini API key"""
+    global gemini_api_key
+    if gemini_api_key is not None:
+        return
     
     gemini_api_key = os.getenv('GEMINI_API_KEY')
     if gemini_api_key:
-        genai.configure(api_key=gemini_api_key)
-        model = genai.GenerativeModel('gemini-1.5-flash')
-        print("Gemini API initialized successfully")
+        logger.info("Gemini API initialized successfully")
     else:
-        print("Warning: GEMINI_API_KEY not found in environment variables")
-        model = None
-except Exception as e:
-    print(f"Warning: Gemini API initialization failed: {e}")
-    model = None
-
-# Language mappings for Gemini prompts
-LANGUAGE_NAMES = {
-    'en': 'English',
-    'hi': 'Hindi (हिन्दी)',
-    'ta': 'Tamil (தமிழ்)',
-    'te': 'Telugu (తెలుగు)',
-    'kn': 'Kannada (ಕನ್ನಡ)',
-    'ml': 'Malayalam (മലയാളം)',
-    'mr': 'Marathi (मराठी)',
-    'gu': 'Gujarati (ગુજરાતી)',
-    'bn': 'Bengali (বাংলা)',
-    'pa': 'Punjabi (ਪੰਜਾਬੀ)',
-    'or': 'Odia (ଓଡ଼ିଆ)',
-    'as': 'Assamese (অসমীয়া)'
-}
+        logger.warning("GEMINI_API_KEY not found in environment variables")
+        gemini_api_key = None
 
-async def get_pest_recommendation_async(label: str, lang: str = 'en') -> Dict[str, Any]:
-    """
-    Get localized pest recommendation using Firebase cache or Gemini API (Async)
-    
-    Args:
-        label (str): Predicted pest/disease label
-        lang (str): Language code (e.g., 'en', 'hi', 'ta')
-    
-    Returns:
-        dict: Recommendation data with source information
-    """
+def initialize_clients() -> None:
+    """Initialize all external clients (Firebase, Gemini)"""
+    initialize_firebase()
+    initialize_gemini()
+
+async def warm_up_firestore_async() -> None:
+    """Open the Firestore gRPC channel with a throwaway read so the first request doesn't pay for it"""
     try:
-        # Create cache key
-        cache_key = f"{label}::{lang}"
-        
-        # Try to get from Firebase cache first
-        cached_result = await get_from_firestore_cache_async(cache_key)
-        if cached_result:
-            return {
-                "source": "firebase",
-                "data": cached_result
-            }
-        
-        # If not in cache, generate using Gemini API
-        if model:
-            gemini_result = await generate_gemini_recommendation_async(label, lang)
-            if gemini_result:
-                # Cache the result in Firestore (non-blocking)
-                asyncio.create_task(cache_to_firestore_async(cache_key, gemini_result))
-                return {
-                    "source": "gemini",
-                    "data": gemini_result
-                }
-        
-        # Fallback to default response
-        fallback = get_fallback_recommendation(label, lang)
-        return {
-            "source": "fallback", 
-            "data": fallback
-        }
+        if not db:
+            return
         
+        loop = asyncio.get_running_loop()
+        doc_ref = db.collection('remedies').document('__warmup__')
+        await loop.run_in_executor(None, doc_ref.get)
+        logger.info("Firestore connection warmed up")
     except Exception as e:
-        print(f"Error getting pest recommendation: {e}")
-        fallback = get_fallback_recommendation(label, lang)
-        return {
-            "source": "fallback",
-            "data": fallback
-        }
+        logger.warning("Firestore warm-up failed: %s", e)
+
+# Gemini prompt template; {language_name} and {label} are filled with str.replace
+GEMINI_PROMPT_TEMPLATE = """
+You are an expert agricultural pathologist specializing in Indian farming practices. 
+
+Analyze this plant disease/pest: "{label}"
+
+Provide a comprehensive response in {language_name} language with the following structure:
+
+1. DIAGNOSIS: Detailed description of the disease/pest condition, symptoms, and impact on the crop
+2. CAUSAL_AGENT: Scientific name and type of pathogen/pest (fungus, bacteria, virus, insect, etc.)
+3. TREATMENTS: List of 3-4 practical treatment recommendations suitable for Indian farmers, including:
+   - Local/organic remedies using common household items
+   - Chemical pesticides/fungicides available in Indian markets
+   - Preventive agricultural practices
+   - Cultural management techniques
+
+Format your response as a valid JSON object with these exact keys:
+{
+    "diagnosis": "detailed diagnosis in {language_name}",
+    "causal_agent": "scientific name and type of pathogen/pest in {language_name}",
+    "treatments": [
+        "treatment 1 in {language_name}",
+        "treatment 2 in {language_name}",
+        "treatment 3 in {language_name}",
+        "treatment 4 in {language_name}"
+    ]
+}
+
+Important notes:
+- Use simple, farmer-friendly language
+- Include local Indian pesticide/fungicide brand names when relevant
+- Consider cost-effective solutions for small-scale farmers
+- Mention organic/natural alternatives when possible
+- Ensure all text is in {language_name} language
+"""
+
+# Markdown code fences Gemini sometimes wraps its JSON in (```json, ```JSON or bare ```)
+_FENCE_PREFIX = re.compile(r'^\s*```(?:json)?\s*', re.IGNORECASE)
+_FENCE_SUFFIX = re.compile(r'\s*```\s*$')
+
+# One prompt per language with the language name already substituted
+_GEMINI_PROMPTS = {
+    lang: GEMINI_PROMPT_TEMPLATE.replace('{language_name}', language_name)
+    for lang, language_name in LANGUAGE_NAMES.items()
+}
+
+def get_from_memory_cache(cache_key: str) -> Optional[Dict[str, Any]]:
+    """Return an unexpired recommendation from the in-process LRU cache, or None"""
+    entry = _memory_cache.get(cache_key)
+    if entry is None:
+        return None
+    expires_at, data = entry
+    if expires_at <= time.monotonic():
+        del _memory_cache[cache_key]
+        return None
+    _memory_cache.move_to_end(cache_key)
+    return data
+
+def store_in_memory_cache(cache_key: str, data: Dict[str, Any], ttl: float) -> None:
+    """Store a recommendation in the in-process LRU cache for ttl seconds, evicting the oldest entry"""
+    _memory_cache[cache_key] = (time.monotonic() + ttl, data)
+    _memory_cache.move_to_end(cache_key)
+    if len(_memory_cache) > MEMORY_CACHE_SIZE:
+        _memory_cache.popitem(last=False)
 
 async def get_from_firestore_cache_async(cache_key: str) -> Optional[Dict[str, Any]]:
     """
@@ -125,25 +169,46 @@ async def get_from_firestore_cache_async(cache_key: str) -> Optional[Dict[str, A
             return None
         
         # Run Firestore operation in executor to avoid blocking
-        loop = asyncio.get_event_loop()
+        loop = asyncio.get_running_loop()
         doc_ref = db.collection('remedies').document(cache_key)
         doc = await loop.run_in_executor(None, doc_ref.get)
         
         if doc.exists:
-            data = doc.to_dict()
-            print(f"Retrieved from Firestore cache: {cache_key}")
-            return {
-                'diagnosis': data.get('diagnosis', ''),
-                'causal_agent': data.get('causal_agent', ''),
-                'treatments': data.get('treatments', [])
-            }
+            logger.info("Retrieved from Firestore cache: %s", cache_key)
+            return _from_cache_data(doc.to_dict())
         
         return None
         
     except Exception as e:
-        print(f"Error retrieving from Firestore cache: {e}")
+        logger.error("Error retrieving from Firestore cache: %s", e)
         return None
 
+async def get_many_from_firestore_cache_async(cache_keys: List[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Retrieve several recommendations from Firestore cache in one round trip (Async)
+    
+    Args:
+        cache_keys (list): Cache keys in format "label::lang"
+    
+    Returns:
+        dict: Cached recommendation data by cache key, for the keys that exist
+    """
+    try:
+        if not db or not cache_keys:
+            return {}
+        
+        refs = [db.collection('remedies').document(cache_key) for cache_key in cache_keys]
+        
+        # get_all returns a generator that performs the RPC, so drain it in the executor
+        loop = asyncio.get_running_loop()
+        docs = await loop.run_in_executor(None, lambda: list(db.get_all(refs)))
+        
+        return {doc.id: _from_cache_data(doc.to_dict()) for doc in docs if doc.exists}
+        
+    except Exception as e:
+        logger.error("Error retrieving from Firestore cache: %s", e)
+        return {}
+
 async def cache_to_firestore_async(cache_key: str, recommendation_data: Dict[str, Any]) -> None:
     """
     Cache recommendation to Firestore (Async)
@@ -156,110 +221,169 @@ async def cache_to_firestore_async(cache_key: str, recommendation_data: Dict[str
         if not db:
             return
         
-        # Prepare cache data
-        cache_data = {
-            'diagnosis': recommendation_data.get('diagnosis', ''),
-            'causal_agent': recommendation_data.get('causal_agent', ''),
-            'treatments': recommendation_data.get('treatments', []),
-            'cached_at': firestore.SERVER_TIMESTAMP,
-            'source': 'gemini'
-        }
-        
         # Run Firestore operation in executor to avoid blocking
-        loop = asyncio.get_event_loop()
+        loop = asyncio.get_running_loop()
         doc_ref = db.collection('remedies').document(cache_key)
-        await loop.run_in_executor(None, doc_ref.set, cache_data)
+        await loop.run_in_executor(None, doc_ref.set, _to_cache_data(recommendation_data))
         
-        print(f"Cached to Firestore: {cache_key}")
+        logger.info("Cached to Firestore: %s", cache_key)
         
     except Exception as e:
-        print(f"Error caching to Firestore: {e}")
+        logger.error("Error caching to Firestore: %s", e)
+
+async def cache_many_to_firestore_async(recommendations: Dict[str, Dict[str, Any]]) -> None:
+    """
+    Cache several recommendations to Firestore using batched writes (Async)
+    
+    Args:
+        recommendations (dict): Recommendation data by cache key
+    """
+    try:
+        if not db or not recommendations:
+            return
+        
+        items = list(recommendations.items())
+        batches = []
+        for start in range(0, len(items), FIRESTORE_BATCH_SIZE):
+            batch = db.batch()
+            for cache_key, recommendation_data in items[start:start + FIRESTORE_BATCH_SIZE]:
+                batch.set(db.collection('remedies').document(cache_key), _to_cache_data(recommendation_data))
+            batches.append(batch)
+        
+        # Commit the batches concurrently in the executor
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(None, batch.commit) for batch in batches))
+        
+        logger.info("Cached %s recommendations to Firestore in %s batch(es)", len(items), len(batches))
+        
+    except Exception as e:
+        logger.error("Error caching to Firestore: %s", e)
+
+def schedule_firestore_cache(recommendations: Dict[str, Dict[str, Any]]) -> None:
+    """
+    Write recommendations to Firestore in the background without waiting for the RPC
+    
+    Keys that already have a write in flight are skipped, so concurrent identical
+    uploads produce a single write.
+    
+    Args:
+        recommendations (dict): Recommendation data by cache key
+    """
+    if not db:
+        return
+    
+    new_items = {key: data for key, data in recommendations.items() if key not in _pending_writes}
+    if not new_items:
+        return
+    
+    if len(new_items) == 1:
+        task = asyncio.create_task(cache_to_firestore_async(*next(iter(new_items.items()))))
+    else:
+        task = asyncio.create_task(cache_many_to_firestore_async(new_items))
+    
+    for key in new_items:
+        _pending_writes[key] = task
+    
+    def _release(_):
+        for key in new_items:
+            if _pending_writes.get(key) is task:
+                del _pending_writes[key]
+    
+    task.add_done_callback(_release)
 
-async def generate_gemini_recommendation_async(label: str, lang: str) -> Optional[Dict[str, Any]]:
+def _to_cache_data(recommendation_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the Firestore document stored for a recommendation"""
+    from firebase_admin import firestore
+    
+    return {
+        'diagnosis': recommendation_data.get('diagnosis', ''),
+        'causal_agent': recommendation_data.get('causal_agent', ''),
+        'treatments': recommendation_data.get('treatments', []),
+        'cached_at': firestore.SERVER_TIMESTAMP,
+        'source': 'gemini'
+    }
+
+def _from_cache_data(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Extract recommendation fields from a cached Firestore document"""
+    return {
+        'diagnosis': data.get('diagnosis', ''),
+        'causal_agent': data.get('causal_agent', ''),
+        'treatments': data.get('treatments', [])
+    }
+
+async def generate_gemini_recommendation_async(
+    label: str,
+    lang: str,
+    session: Optional[aiohttp.ClientSession] = None
+) -> Optional[Dict[str, Any]]:
     """
     Generate pest recommendation using Gemini API (Async)
     
     Args:
         label (str): Pest/disease label
         lang (str): Language code
+        session (aiohttp.ClientSession, optional): Shared HTTP session; a
+            temporary one is opened when not provided
     
     Returns:
         dict: Generated recommendation
     """
+    # Stays None when the API envelope itself fails to decode
+    response_text = None
     try:
-        language_name = LANGUAGE_NAMES.get(lang, 'English')
+        if not gemini_api_key:
+            return None
         
-        # Create detailed prompt for Gemini
-        prompt = f"""
-You are an expert agricultural pathologist specializing in Indian farming practices. 
-
-Analyze this plant disease/pest: "{label}"
-
-Provide a comprehensive response in {language_name} language with the following structure:
-
-1. DIAGNOSIS: Detailed description of the disease/pest condition, symptoms, and impact on the crop
-2. CAUSAL_AGENT: Scientific name and type of pathogen/pest (fungus, bacteria, virus, insect, etc.)
-3. TREATMENTS: List of 3-4 practical treatment recommendations suitable for Indian farmers, including:
-   - Local/organic remedies using common household items
-   - Chemical pesticides/fungicides available in Indian markets
-   - Preventive agricultural practices
-   - Cultural management techniques
-
-Format your response as a valid JSON object with these exact keys:
-{{
-    "diagnosis": "detailed diagnosis in {language_name}",
-    "causal_agent": "scientific name and type of pathogen/pest in {language_name}",
-    "treatments": [
-        "treatment 1 in {language_name}",
-        "treatment 2 in {language_name}",
-        "treatment 3 in {language_name}",
-        "treatment 4 in {language_name}"
-    ]
-}}
-
-Important notes:
-- Use simple, farmer-friendly language
-- Include local Indian pesticide/fungicide brand names when relevant
-- Consider cost-effective solutions for small-scale farmers
-- Mention organic/natural alternatives when possible
-- Ensure all text is in {language_name} language
-"""
-
-        # Generate response using asyncio executor
-        loop = asyncio.get_event_loop()
-        response = await loop.run_in_executor(
-            None, 
-            model.generate_content, 
-            prompt
-        )
+        # Language is pre-substituted; only the label varies per call
+        prompt = _GEMINI_PROMPTS.get(lang, _GEMINI_PROMPTS['en']).replace('{label}', label)
         
-        response_text = response.text.strip()
+        # Generate response through the Gemini REST API
+        if session is not None:
+            response_text = await _post_gemini_prompt(session, prompt)
+        else:
+            async with aiohttp.ClientSession() as temp_session:
+                response_text = await _post_gemini_prompt(temp_session, prompt)
         
         # Clean up the response text to extract JSON
-        if response_text.startswith('```json'):
-            response_text = response_text[7:]
-        if response_text.endswith('```'):
-            response_text = response_text[:-3]
+        response_text = _FENCE_SUFFIX.sub('', _FENCE_PREFIX.sub('', response_text, count=1), count=1)
         
         # Parse JSON response
-        recommendation_data = json.loads(response_text.strip())
+        recommendation_data = orjson.loads(response_text)
         
         # Validate required fields
         required_fields = ['diagnosis', 'causal_agent', 'treatments']
         if all(field in recommendation_data for field in required_fields):
             return recommendation_data
         else:
-            print(f"Invalid Gemini response format: missing required fields")
+            logger.error("Invalid Gemini response format: missing required fields")
             return None
             
-    except json.JSONDecodeError as e:
-        print(f"Error parsing Gemini JSON response: {e}")
-        print(f"Raw response: {response_text}")
+    except orjson.JSONDecodeError as e:
+        logger.error("Error parsing Gemini JSON response: %s", e)
+        logger.error("Raw response: %s", response_text)
         return None
     except Exception as e:
-        print(f"Error generating Gemini recommendation: {e}")
+        logger.error("Error generating Gemini recommendation: %s", e)
         return None
 
+async def _post_gemini_prompt(session: aiohttp.ClientSession, prompt: str) -> str:
+    """
+    Send a prompt to the Gemini generateContent endpoint
+    
+    Args:
+        session (aiohttp.ClientSession): HTTP session to send the request with
+        prompt (str): Prompt text
+    
+    Returns:
+        str: Text of the first candidate in the response
+    """
+    payload = {"contents": [{"parts": [{"text": prompt}]}]}
+    headers = {"x-goog-api-key": gemini_api_key, "Content-Type": "application/json"}
+    async with session.post(GEMINI_API_URL, data=orjson.dumps(payload), headers=headers) as response:
+        response.raise_for_status()
+        data = orjson.loads(await response.read())
+    return data["candidates"][0]["content"]["parts"][0]["text"]
+
 def get_fallback_recommendation(label: str, lang: str) -> Dict[str, Any]:
     """
     Generate fallback recommendation when Gemini API fails
@@ -2,27 +2,48 @@
 Recommendation service for pest management advice
 """
 import asyncio
-from typing import Dict, Any, Optional
+import logging
+from typing import Dict, Any, List, Optional
 
-from app.core.config import settings, LANGUAGE_NAMES
-from app.core.exceptions import ExternalAPIException
+import aiohttp
+
+from app.core.config import settings
 from app.helpers_async import (
-    get_pest_recommendation_async as get_recommendation,
+    initialize_clients,
+    warm_up_firestore_async,
+    get_from_memory_cache,
+    store_in_memory_cache,
     get_from_firestore_cache_async,
+    get_many_from_firestore_cache_async,
     cache_to_firestore_async,
+    schedule_firestore_cache,
     generate_gemini_recommendation_async,
     get_fallback_recommendation
 )
 
+logger = logging.getLogger(__name__)
+
 
 class RecommendationService:
     """Service for handling pest management recommendations"""
     
-    def __init__(self):
-        """Initialize recommendation service"""
+    def __init__(self, http_client: Optional[aiohttp.ClientSession] = None):
+        """
+        Initialize recommendation service
+        
+        Args:
+            http_client: Shared HTTP session used for Gemini API calls
+        """
+        self.http_client = http_client
         self.cache_enabled = settings.CACHE_ENABLED
         self.cache_ttl = settings.CACHE_TTL
     
+    async def initialize(self):
+        """Initialize Firebase and Gemini clients"""
+        initialize_clients()
+        if self.cache_enabled:
+            await warm_up_firestore_async()
+    
     async def get_recommendation_async(self, pest_label: str, language_code: str) -> Dict[str, Any]:
         """
         Get pest management recommendation for given pest and language
@@ -39,17 +60,93 @@ class RecommendationService:
             if language_code not in settings.SUPPORTED_LANGUAGES:
                 raise ValueError(f"Unsupported language: {language_code}")
             
-            # Get recommendation using the existing async helper
-            recommendation = await get_recommendation(pest_label, language_code)
+            cache_key = f"{pest_label}::{language_code}"
             
-            return recommendation
+            # Serve hot labels from process memory
+            if self.cache_enabled:
+                memory = get_from_memory_cache(cache_key)
+                if memory is not None:
+                    return {'data': memory, 'source': 'memory'}
+            
+            # Try the Firestore cache next
+            cached = await self.get_cached_recommendation(pest_label, language_code)
+            if cached:
+                store_in_memory_cache(cache_key, cached, self.cache_ttl)
+                return {'data': cached, 'source': 'firebase'}
+            
+            # Generate on a cache miss and cache the result without waiting
+            generated = await self.generate_new_recommendation(pest_label, language_code)
+            if generated:
+                if self.cache_enabled:
+                    store_in_memory_cache(cache_key, generated, self.cache_ttl)
+                    schedule_firestore_cache({cache_key: generated})
+                return {'data': generated, 'source': 'gemini'}
+            
+            fallback = get_fallback_recommendation(pest_label, language_code)
+            return {'data': fallback, 'source': 'fallback'}
             
         except Exception as e:
-            print(f"Error getting recommendation: {e}")
+            logger.error("Error getting recommendation: %s", e)
             # Return fallback recommendation
             fallback = get_fallback_recommendation(pest_label, language_code)
             return {'data': fallback, 'source': 'fallback'}
 
+    async def get_recommendations_async(self, pest_labels: List[str], language_code: str) -> List[Dict[str, Any]]:
+        """
+        Get recommendations for several labels concurrently
+        
+        Args:
+            pest_labels: The pest/disease labels
+            language_code: Language code
+            
+        Returns:
+            Recommendations in the same order as pest_labels
+        """
+        if language_code not in settings.SUPPORTED_LANGUAGES or not self.cache_enabled:
+            return await asyncio.gather(
+                *(self.get_recommendation_async(label, language_code) for label in pest_labels)
+            )
+        
+        results = {}
+        
+        # Serve what we can from memory, then fetch the rest from Firestore in one round trip
+        missing = []
+        for label in dict.fromkeys(pest_labels):
+            memory = get_from_memory_cache(f"{label}::{language_code}")
+            if memory is not None:
+                results[label] = {'data': memory, 'source': 'memory'}
+            else:
+                missing.append(label)
+        
+        cached = await get_many_from_firestore_cache_async([f"{label}::{language_code}" for label in missing])
+        to_generate = []
+        for label in missing:
+            cache_key = f"{label}::{language_code}"
+            if cache_key in cached:
+                store_in_memory_cache(cache_key, cached[cache_key], self.cache_ttl)
+                results[label] = {'data': cached[cache_key], 'source': 'firebase'}
+            else:
+                to_generate.append(label)
+        
+        # Generate the misses concurrently and write them back in batches
+        generated = await asyncio.gather(
+            *(self.generate_new_recommendation(label, language_code) for label in to_generate)
+        )
+        to_cache = {}
+        for label, data in zip(to_generate, generated):
+            if data:
+                cache_key = f"{label}::{language_code}"
+                store_in_memory_cache(cache_key, data, self.cache_ttl)
+                to_cache[cache_key] = data
+                results[label] = {'data': data, 'source': 'gemini'}
+            else:
+                results[label] = {'data': get_fallback_recommendation(label, language_code), 'source': 'fallback'}
+        
+        if to_cache:
+            schedule_firestore_cache(to_cache)
+        
+        return [results[label] for label in pest_labels]
+
     async def get_recommendation(self, pest_label: str, language_code: str) -> Dict[str, Any]:
         """Alias for backward compatibility"""
         return await self.get_recommendation_async(pest_label, language_code)
@@ -98,9 +195,11 @@ class RecommendationService:
             Generated recommendation data or None if failed
         """
         try:
-            return await generate_gemini_recommendation_async(pest_label, language_code)
+            return await generate_gemini_recommendation_async(
+                pest_label, language_code, self.http_client
+            )
         except Exception as e:
-            print(f"Error generating recommendation with Gemini: {e}")
+            logger.error("Error generating recommendation with Gemini: %s", e)
             return None
     
     def get_fallback_recommendation(self, pest_label: str, language_code: str) -> Dict[str, Any]:
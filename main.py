@@ -3,42 +3,23 @@ HarvestHub Pest Detection API - FastAPI Application
 A modern, async-first API for multilingual pest detection and recommendations.
 """
 
-from contextlib import asynccontextmanager
+import logging
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from fastapi.middleware.gzip import GZipMiddleware
+from brotli_asgi import BrotliMiddleware
 
-from app.api.routes import health, prediction, languages, docs
+from app.api.routes import api_router
 from app.core.config import settings
 from app.core.exceptions import add_exception_handlers
+from app.core.lifespan import lifespan
 from app.core.middleware import add_custom_middleware
-from app.services.model_service import ModelService
 
-
-@asynccontextmanager
-async def lifespan(app: FastAPI):
-    """Application lifespan handler"""
-    # Startup
-    print("🚀 HarvestHub FastAPI server starting up...")
-    
-    # Initialize model service
-    model_service = ModelService()
-    await model_service.initialize()
-    
-    # Store in app state
-    app.state.model_service = model_service
-    
-    print(f"📊 Model loaded: {model_service.is_model_loaded()}")
-    print(f"🏷️ Labels loaded: {model_service.get_total_classes()} classes")
-    print(f"🌐 Supported languages: {len(settings.SUPPORTED_LANGUAGES)}")
-    print("✅ FastAPI server ready!")
-    
-    yield
-    
-    # Shutdown
-    print("🛑 HarvestHub FastAPI server shutting down...")
-    print("✅ Cleanup completed!")
+# Configure logging
+logging.basicConfig(
+    level=getattr(logging, settings.LOG_LEVEL.upper()),
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
 
 
 # Create FastAPI application
@@ -46,9 +27,9 @@ app = FastAPI(
     title=settings.API_TITLE,
     description=settings.API_DESCRIPTION,
     version=settings.API_VERSION,
-    docs_url="/docs",
-    redoc_url="/redoc",
-    openapi_url="/openapi.json",
+    docs_url="/docs" if settings.DOCS_ENABLED else None,
+    redoc_url="/redoc" if settings.DOCS_ENABLED else None,
+    openapi_url="/openapi.json" if settings.DOCS_ENABLED else None,
     lifespan=lifespan,
     contact={
         "name": "HarvestHub Team",
@@ -61,7 +42,7 @@ app = FastAPI(
 )
 
 # Add middleware
-app.add_middleware(GZipMiddleware, minimum_size=1000)
+app.add_middleware(BrotliMiddleware, quality=4, minimum_size=1000)  # falls back to gzip for clients without br
 app.add_middleware(TrustedHostMiddleware, allowed_hosts=["*"])
 app.add_middleware(
     CORSMiddleware,
@@ -78,23 +59,7 @@ add_custom_middleware(app)
 add_exception_handlers(app)
 
 # Include routers
-app.include_router(health.router, tags=["Health"])
-app.include_router(prediction.router, tags=["Prediction"])
-app.include_router(languages.router, tags=["Languages"])
-app.include_router(docs.router, tags=["Documentation"])
-
-
-# Root endpoint
-@app.get("/", include_in_schema=False)
-async def root():
-    """Root endpoint redirect to docs"""
-    return {
-        "message": "Welcome to HarvestHub Pest Detection API",
-        "version": settings.API_VERSION,
-        "docs": "/docs",
-        "health": "/health",
-        "status": "online"
-    }
+app.include_router(api_router)
 
 
 if __name__ == "__main__":
@@ -103,6 +68,10 @@ if __name__ == "__main__":
         "main:app",
         host=settings.HOST,
         port=settings.PORT,
+        workers=settings.WORKERS,
         reload=settings.RELOAD,
-        log_level=settings.LOG_LEVEL
+        log_level=settings.LOG_LEVEL,
+        access_log=settings.ACCESS_LOG,
+        loop="uvloop",
+        http="httptools"
     )